@@ -0,0 +1,177 @@
+# --- employee_directory.py ---
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+PARTNER_CSV_PATH = "partner_streamlit.csv"
+
+# Columns with a precomputed row-index array per distinct value.
+INDEXED_COLUMNS = ["Partner", "Department", "Location", "ManagerName", "Region"]
+
+# --- kenya_towns.py content (as provided) ---
+kenya_towns = {
+    "Nairobi": [
+        "Westlands", "Kilimani", "Kenyatta", "Karen", "Eastleigh",
+        "Lang’ata", "South B", "South C", "Ruaraka", "Dagoretti",
+        "Kasarani", "Gikambura"
+    ],
+    "Mombasa": [
+        "Mombasa Island", "Nyali", "Likoni", "Changamwe", "Kisauni",
+        "Bamburi", "Port Reitz", "Tudor", "Shanzu"
+    ],
+    "Uasin Gishu (Eldoret)": [
+        "Eldoret", "Turbo", "Ziwa", "Moi’s Bridge", "Kesses",
+        "Burnt Forest", "Soy"
+    ],
+    "Kisumu": [
+        "Kisumu", "Ahero", "Maseno", "Muhoroni", "Nyahera",
+        "Kombewa", "Koru", "Katito", "Kajulu"
+    ],
+    "Kajiado": [
+        "Kajiado", "Ngong", "Kitengela", "Isinya", "Namanga",
+        "Ongata Rongai", "Loitokitok", "Ilbisil", "Magadi"
+    ]
+}
+
+_EMPTY_ROWS = np.empty(0, dtype=np.intp)
+
+_cache_lock = threading.Lock()
+_cached_directory = None
+
+
+def normalize_name(name):
+    """Lower-cases a name and collapses repeated whitespace ("Adinolfi, Wilson  K")."""
+    return " ".join(str(name).split()).lower()
+
+
+def _town_to_region():
+    """Flattens kenya_towns into a town -> region map. A region's own name counts as one of its towns."""
+    lookup = {}
+    for region, towns in kenya_towns.items():
+        lookup[region] = region
+        for town in towns:
+            lookup[town] = region
+    return lookup
+
+
+class EmployeeRecord:
+    """A single employee's identifying fields; 'row' is the position in EmployeeDirectory.data."""
+    __slots__ = ("row", "emp_id", "name", "partner", "department", "location", "region", "manager")
+
+    def __init__(self, row, emp_id, name, partner, department, location, region, manager):
+        self.row = row
+        self.emp_id = emp_id
+        self.name = name
+        self.partner = partner
+        self.department = department
+        self.location = location
+        self.region = region
+        self.manager = manager
+
+    def __repr__(self):
+        return f"EmployeeRecord({self.emp_id}, {self.name!r}, {self.partner!r})"
+
+
+class EmployeeDirectory:
+    """
+    Read-only index over the partner employee DataFrame.
+    Offers O(1) lookup by EmpID and by normalized name, and a row-position array per
+    Partner, Department, Location, ManagerName and Region so slices are a single `take`.
+
+    EmpID is not unique in the partner CSV (the same id is reused across partners), so
+    every key maps to a list of records. get()/find() never pick one silently: they raise
+    ValueError when a key matches several employees, unless 'partner' narrows it to one.
+    Repeated keys are listed in duplicate_ids / duplicate_names.
+    """
+
+    def __init__(self, data, version=None):
+        data = data.reset_index(drop=True)
+        # Department/Location values carry trailing spaces in the CSV.
+        for column in ["Partner", "Department", "Location", "ManagerName"]:
+            data[column] = data[column].astype(str).str.strip()
+        data["Region"] = data["Location"].map(_town_to_region())
+
+        self.data = data
+        self.version = version
+        self._by_id = {}
+        self._by_name = {}
+        self._records = []
+        columns = zip(data["EmpID"], data["Employee_Name"], data["Partner"], data["Department"],
+                      data["Location"], data["Region"], data["ManagerName"])
+        for row, (emp_id, name, partner, department, location, region, manager) in enumerate(columns):
+            record = EmployeeRecord(row, int(emp_id), " ".join(str(name).split()), partner,
+                                    department, location, region if pd.notna(region) else None, manager)
+            self._records.append(record)
+            self._by_id.setdefault(record.emp_id, []).append(record)
+            self._by_name.setdefault(normalize_name(name), []).append(record)
+
+        self.duplicate_ids = sorted(key for key, records in self._by_id.items() if len(records) > 1)
+        self.duplicate_names = sorted(key for key, records in self._by_name.items() if len(records) > 1)
+        if self.duplicate_ids or self.duplicate_names:
+            print(f"Employee directory: {len(self.duplicate_ids)} EmpIDs and {len(self.duplicate_names)} "
+                  f"names are shared by more than one employee: {self.duplicate_ids + self.duplicate_names}")
+
+        # groupby(...).indices gives {value: ndarray of row positions}; NaN keys are dropped.
+        self._index = {column: data.groupby(column, sort=False).indices for column in INDEXED_COLUMNS}
+
+    def __len__(self):
+        return len(self._records)
+
+    def get_all(self, emp_id):
+        """Returns every EmployeeRecord with this EmpID (empty if none)."""
+        try:
+            return list(self._by_id.get(int(emp_id), []))
+        except (TypeError, ValueError):
+            return []
+
+    def find_all(self, name):
+        """Returns every EmployeeRecord with this name (case/whitespace-insensitive)."""
+        return list(self._by_name.get(normalize_name(name), []))
+
+    def get(self, emp_id, partner=None):
+        """Returns the one EmployeeRecord for an EmpID (optionally within 'partner'), or None."""
+        return _single(self.get_all(emp_id), partner, f"EmpID {emp_id}")
+
+    def find(self, name, partner=None):
+        """Returns the one EmployeeRecord for an employee name (optionally within 'partner'), or None."""
+        return _single(self.find_all(name), partner, f"name {name!r}")
+
+    def values(self, column):
+        """Returns the distinct values of an indexed column in first-seen order."""
+        return list(self._index[column].keys())
+
+    def rows(self, column, value):
+        """Returns the row positions for 'value' in an indexed column (empty if absent)."""
+        return self._index[column].get(value, _EMPTY_ROWS)
+
+    def slice(self, column, value):
+        """Returns the rows of self.data where 'column' == 'value'."""
+        return self.data.take(self.rows(column, value))
+
+
+def _single(records, partner, label):
+    if partner is not None:
+        records = [record for record in records if record.partner == partner]
+    if len(records) > 1:
+        raise ValueError(f"{label} matches {len(records)} employees: {records}")
+    return records[0] if records else None
+
+
+def dataset_version(path=PARTNER_CSV_PATH):
+    """Identifies the current contents of the partner CSV by modification time and size."""
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def get_directory(path=PARTNER_CSV_PATH):
+    """
+    Returns the process-wide EmployeeDirectory for the partner CSV.
+    The directory is rebuilt only when the file changes.
+    """
+    global _cached_directory
+    version = (path, dataset_version(path))
+    with _cache_lock:
+        if _cached_directory is None or _cached_directory.version != version:
+            _cached_directory = EmployeeDirectory(pd.read_csv(path), version)
+        return _cached_directory
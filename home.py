@@ -3,30 +3,28 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from millify import prettify
+from leave_shards import fetch_all_leaves
+from employee_directory import get_directory
+from workforce_trends import get_turnover_rate
 
 
 
 
 
 # Backend Code
-data = pd.read_csv("partner_streamlit.csv")
+directory = get_directory()
+data = directory.data
 
 # Create SheerLogic and Fine Media Dataframes
-terminated_sheerlogic = data[data['Partner'] == 'Sheer Logic']
+terminated_sheerlogic = directory.slice('Partner', 'Sheer Logic')
 headcount_sheerlogic = len(terminated_sheerlogic)
-terminated_fine_media = data[data['Partner'] == 'Fine Media'] 
+terminated_fine_media = directory.slice('Partner', 'Fine Media')
 headcount_fine_media = len(terminated_fine_media)
 
-# Count the number of terminated employees (non-null values in 'DateofTermination')
-terminated_sheerlogic_COUNT = terminated_sheerlogic['DateofTermination'].notnull().sum()
-terminated_fine_media_COUNT = terminated_fine_media['DateofTermination'].notnull().sum()
-
-# Count the total number of employees
-total_employees = len(data)
-
-# Calculate the turnover rate
-turnover_rate_sheerlogic = round((terminated_sheerlogic_COUNT / total_employees) * 100,1)
-turnover_rate_fine_media = round((terminated_fine_media_COUNT / total_employees) * 100,1) 
+# Calculate the turnover rate: each partner's leavers over that partner's own headcount.
+# "Active" in 'DateofTermination' means the employee is still employed.
+turnover_rate_sheerlogic = get_turnover_rate('Partner', 'Sheer Logic')
+turnover_rate_fine_media = get_turnover_rate('Partner', 'Fine Media')
 leave_area_chart = data[['Partner','Amnt_Denied_Leave_Request']]
 
 # Pie Chart
@@ -45,13 +43,9 @@ fig_gauge = go.Figure(go.Indicator(
     title = {'text': "Speed"}))
 
 
-leave_liability_sheerlogic = data[data['Partner'] == 'Sheer Logic']
-leave_liability_sheerlogic = round(leave_liability_sheerlogic['Leave_Liability'].sum())
-
-
-leave_liability_fine_media = data[data['Partner'] == 'Fine Media']
+leave_liability_sheerlogic = round(terminated_sheerlogic['Leave_Liability'].sum())
 
-leave_liability_fine_media = round(leave_liability_fine_media['Leave_Liability'].sum())
+leave_liability_fine_media = round(terminated_fine_media['Leave_Liability'].sum())
 
 leave_liability_sheerlogic = prettify(leave_liability_sheerlogic)
 
@@ -90,17 +84,17 @@ st.plotly_chart(fig)
 
 st.divider()
 try:
-    data = pd.read_csv("partner_streamlit.csv")
+    data = get_directory().data
     st.subheader("Partner Performance")
 
     # Dropdown for filtering by partner
     selected_partner = st.selectbox(
         "Select Partner:",
-        data['Partner'].unique()
+        directory.values('Partner')
     )
 
     # Filter data based on selected partner
-    filtered_df = data[data['Partner'] == selected_partner]
+    filtered_df = directory.slice('Partner', selected_partner)
 
     performance = filtered_df['PerformanceScore'].value_counts()
 
@@ -124,8 +118,8 @@ except Exception as e:
 st.divider()
 st.subheader("Leave Management Overview")
 
-# Get all leave data
-leaves_data = leave_data
+# Get all leave data (fanned out across every partner shard when sharding is enabled)
+leaves_data = fetch_all_leaves()
 
 if leaves_data:
     leaves_df = pd.DataFrame(leaves_data)
@@ -3,17 +3,23 @@ import streamlit as st
 import pandas as pd
 import sqlite3
 from datetime import date
-
-# Define the path to your SQLite database
-DB_PATH = 'leave_management.db'
+from leave_shards import (
+    all_shard_paths, route_employee, shard_path_for_leave, get_employee_rows,
+    fan_out_rows, get_partner_leave_metrics, fetch_all_leaves,
+)
 
 def init_db():
     """
     Initializes the SQLite database and creates the 'leaves' table if it doesn't exist.
+    With partner sharding enabled the table is created in every partner shard.
     This function should be called once at the start of your main application.
     """
+    for _, db_path in all_shard_paths():
+        _init_leaves_table(db_path)
+
+def _init_leaves_table(db_path):
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(db_path)
         c = conn.cursor()
         c.execute('''
             CREATE TABLE IF NOT EXISTS leaves (
@@ -31,16 +37,17 @@ def init_db():
         ''')
         conn.commit()
         conn.close()
-        print(f"Database initialized at {DB_PATH}")
+        print(f"Database initialized at {db_path}")
     except sqlite3.Error as e:
         print(f"Error initializing database: {e}")
 
-def apply_for_leave(employee_name, leave_type, start_date, end_date, description, attachment):
+def apply_for_leave(employee_name, leave_type, start_date, end_date, description, attachment, partner=None):
     """
     Adds a new leave application to the database with 'Pending' status.
+    The write goes to the employee's partner shard; pass 'partner' to skip the lookup.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(route_employee(employee_name, partner))
         c = conn.cursor()
         c.execute('''
             INSERT INTO leaves (employee_name, leave_type, start_date, end_date, description, attachment, status)
@@ -56,14 +63,10 @@ def get_leave_history(employee_name):
     """
     Fetches the leave history for a specific employee.
     Returns a list of tuples: (leave_type, start_date, end_date, description, status)
+    With sharding this includes leaves still held in the shared database.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT leave_type, start_date, end_date, description, status FROM leaves WHERE employee_name = ?", (employee_name,))
-        history = c.fetchall()
-        conn.close()
-        return history
+        return get_employee_rows(employee_name, "SELECT leave_type, start_date, end_date, description, status FROM leaves WHERE employee_name = ?", (employee_name,))
     except sqlite3.Error as e:
         print(f"Error fetching leave history: {e}")
         return []
@@ -71,25 +74,25 @@ def get_leave_history(employee_name):
 def get_all_pending_leaves():
     """
     Fetches all leave requests with a 'Pending' status for the manager's review.
-    Returns a list of tuples: (id, employee_name, leave_type, start_date, end_date, description)
+    Returns a list of tuples: (id, employee_name, leave_type, start_date, end_date, description, partner)
+    'partner' is the shard the leave lives in; pass it back to update_leave_status.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT id, employee_name, leave_type, start_date, end_date, description FROM leaves WHERE status = 'Pending'")
-        pending_leaves = c.fetchall()
-        conn.close()
-        return pending_leaves
+        return fan_out_rows("SELECT id, employee_name, leave_type, start_date, end_date, description FROM leaves WHERE status = 'Pending'",
+                            with_partner=True)
     except sqlite3.Error as e:
         print(f"Error fetching pending leaves: {e}")
         return []
 
-def update_leave_status(leave_id, new_status, reason=None):
+def update_leave_status(leave_id, new_status, reason=None, partner=None):
     """
     Updates the status of a leave request (Approved, Declined, Recalled, Withdrawn).
+    Leave ids are only unique within a shard, so with sharding enabled 'partner' is required
+    (as returned by the read functions); a ValueError is raised without it.
     """
+    db_path = shard_path_for_leave(partner)
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(db_path)
         c = conn.cursor()
         if new_status == "Declined":
             c.execute("UPDATE leaves SET status = ?, decline_reason = ? WHERE id = ?", (new_status, reason, leave_id))
@@ -108,12 +111,9 @@ def update_leave_status(leave_id, new_status, reason=None):
 def get_team_leaves(status_filter=None, leave_type_filter=None, employee_filter=None):
     """
     Fetches all team leaves with optional filters for the manager's dashboard.
-    Returns a list of tuples: (employee_name, leave_type, start_date, end_date, status, description, decline_reason)
+    Returns a list of tuples: (employee_name, leave_type, start_date, end_date, status, description, decline_reason, partner)
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        
         query = "SELECT employee_name, leave_type, start_date, end_date, status, description, decline_reason FROM leaves WHERE 1=1"
         params = []
 
@@ -133,10 +133,7 @@ def get_team_leaves(status_filter=None, leave_type_filter=None, employee_filter=
             query += " AND employee_name = ?"
             params.append(employee_filter)
 
-        c.execute(query, params)
-        leaves = c.fetchall()
-        conn.close()
-        return leaves
+        return fan_out_rows(query, tuple(params), with_partner=True)
     except sqlite3.Error as e:
         print(f"Error fetching team leaves: {e}")
         return []
@@ -147,50 +144,31 @@ def get_all_employees():
     Returns a list of employee names.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT DISTINCT employee_name FROM leaves")
-        employees = [row[0] for row in c.fetchall()]
-        conn.close()
-        return employees
+        rows = fan_out_rows("SELECT DISTINCT employee_name FROM leaves")
+        return list(dict.fromkeys(row[0] for row in rows))
     except sqlite3.Error as e:
         print(f"Error fetching all employees: {e}")
         return []
 
 def get_all_leaves():
     """
-    Fetches all leave records from the database.
+    Fetches all leave records from the database (every shard when sharding is enabled).
     Returns a list of dictionaries, each representing a leave record.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("SELECT id, employee_name, leave_type, start_date, end_date, description, status FROM leaves")
-        rows = c.fetchall()
-        conn.close()
-        
-        leaves = []
-        for row in rows:
-            leaves.append({
-                "id": row[0],
-                "name": row[1],
-                "type": row[2],
-                "start": row[3],
-                "end": row[4],
-                "description": row[5],
-                "status": row[6]
-            })
-        return leaves
+        return fetch_all_leaves()
     except sqlite3.Error as e:
         print(f"Error fetching all leaves: {e}")
         return []
 
-def withdraw_leave(leave_id, recall_reason=None):
+def withdraw_leave(leave_id, recall_reason=None, partner=None):
     """
     Marks a leave request as 'Withdrawn' with an optional reason.
+    Same 'partner' requirement as update_leave_status.
     """
+    db_path = shard_path_for_leave(partner)
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = sqlite3.connect(db_path)
         c = conn.cursor()
         c.execute("UPDATE leaves SET status = 'Withdrawn', recall_reason = ? WHERE id = ?", (recall_reason, leave_id))
         conn.commit()
@@ -204,27 +182,12 @@ def withdraw_leave(leave_id, recall_reason=None):
 def get_approved_days_for_partner(partner_name):
     """
     Calculates total approved leave days for a specific partner.
-    For simplicity, assuming 'partner_name' can be mapped to 'employee_name' or a group of employees.
-    You might need to adjust this based on how 'Partner' is defined in your DB.
-    Here, we'll sum up approved leaves for employees associated with a 'partner'.
-    This is a placeholder and might need a more sophisticated join/mapping if 'Partner' is not directly in 'leaves' table.
-    For now, it assumes 'employee_name' can be used to group by 'partner'.
+    With partner sharding this is the partner's whole shard plus matching legacy rows in the
+    shared database; otherwise partner membership is guessed by matching 'partner_name'
+    inside 'employee_name'.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        # This query is a simplification. If 'Partner' is a separate entity,
-        # you'd need a more complex query involving a 'partners' table or a mapping.
-        # For now, it counts days for all employees.
-        c.execute("""
-            SELECT SUM(JULIANDAY(end_date) - JULIANDAY(start_date) + 1)
-            FROM leaves
-            WHERE status = 'Approved'
-            AND employee_name LIKE ?  -- Using LIKE for a simple "partner" mapping
-        """, (f"%{partner_name}%",)) # Adjust this if 'partner_name' is a direct employee name
-        approved_days = c.fetchone()[0]
-        conn.close()
-        return approved_days if approved_days is not None else 0
+        return get_partner_leave_metrics([partner_name])[partner_name]["approved_days"]
     except sqlite3.Error as e:
         print(f"Error getting approved days for partner {partner_name}: {e}")
         return 0
@@ -232,20 +195,10 @@ def get_approved_days_for_partner(partner_name):
 def get_denied_requests_for_partner(partner_name):
     """
     Counts total denied leave requests for a specific partner.
-    Similar simplification as get_approved_days_for_partner.
+    Same partner mapping as get_approved_days_for_partner.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute("""
-            SELECT COUNT(id)
-            FROM leaves
-            WHERE status = 'Declined'
-            AND employee_name LIKE ?
-        """, (f"%{partner_name}%",))
-        denied_requests = c.fetchone()[0]
-        conn.close()
-        return denied_requests if denied_requests is not None else 0
+        return get_partner_leave_metrics([partner_name])[partner_name]["denied_requests"]
     except sqlite3.Error as e:
         print(f"Error getting denied requests for partner {partner_name}: {e}")
         return 0
@@ -253,25 +206,12 @@ def get_denied_requests_for_partner(partner_name):
 def get_cumulated_leave_days_for_partner(partner_name):
     """
     Calculates total cumulated leave days for a specific partner.
-    This metric is usually calculated based on company policy (e.g., accrual rate).
-    For demonstration, we'll sum up all leave days (approved, pending, etc.) for employees
-    associated with the partner, assuming 'cumulated' means total allocated/used.
-    A more accurate 'cumulated' would require a separate table for leave accruals.
+    This is a simplified interpretation of "cumulated": the duration of all
+    non-denied/non-withdrawn (Approved and Pending) leaves. A more accurate
+    figure would require a separate table for leave accruals.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        # This is a simplified interpretation of "cumulated".
-        # It sums up the duration of all non-denied/non-withdrawn leaves.
-        c.execute("""
-            SELECT SUM(JULIANDAY(end_date) - JULIANDAY(start_date) + 1)
-            FROM leaves
-            WHERE status IN ('Approved', 'Pending')
-            AND employee_name LIKE ?
-        """, (f"%{partner_name}%",))
-        cumulated_days = c.fetchone()[0]
-        conn.close()
-        return cumulated_days if cumulated_days is not None else 0
+        return get_partner_leave_metrics([partner_name])[partner_name]["cumulated_days"]
     except sqlite3.Error as e:
         print(f"Error getting cumulated leave days for partner {partner_name}: {e}")
         return 0
@@ -282,17 +222,14 @@ def get_upcoming_leaves():
     Returns a list of dictionaries.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
         today = date.today().strftime('%Y-%m-%d')
-        c.execute("""
+        # Each shard returns its rows already ordered; re-sort after merging them.
+        rows = fan_out_rows("""
             SELECT employee_name, leave_type, start_date, end_date
             FROM leaves
             WHERE status = 'Approved' AND start_date > ?
             ORDER BY start_date ASC
-        """, (today,))
-        rows = c.fetchall()
-        conn.close()
+        """, (today,), sort_key=lambda row: str(row[2]))
         
         upcoming_leaves = []
         for row in rows:
@@ -313,17 +250,14 @@ def get_current_leaves():
     Returns a list of dictionaries.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
         today = date.today().strftime('%Y-%m-%d')
-        c.execute("""
+        # Each shard returns its rows already ordered; re-sort after merging them.
+        rows = fan_out_rows("""
             SELECT employee_name, leave_type, start_date, end_date
             FROM leaves
             WHERE status = 'Approved' AND start_date <= ? AND end_date >= ?
             ORDER BY start_date ASC
-        """, (today, today))
-        rows = c.fetchall()
-        conn.close()
+        """, (today, today), sort_key=lambda row: str(row[2]))
         
         current_leaves = []
         for row in rows:
@@ -349,21 +283,21 @@ def leave_management_page():
     st.title("📅 Leave Management Dashboard (HR View)")
 
     # --- Fetching data from SQLite DB for HR metrics ---
-    # NOTE: The 'partner' concept (Fine Media, Sheer Logic) is not directly in the 'leaves' table.
-    # For demonstration, I'm assuming 'employee_name' might contain partner-specific keywords
-    # or you'd have a separate 'employees' table linked to 'partners'.
-    # For a robust solution, you'd need a 'partners' table and link employees to them.
-    # Here, I'm using a simplified `LIKE` query in the database functions.
+    # With USE_PARTNER_SHARDS each partner's leaves live in their own database and the
+    # metrics below are one aggregate query per shard, run in parallel.
+    # Without sharding, partner membership is still guessed from 'employee_name'
+    # with a simplified `LIKE` query (see leave_shards.get_partner_leave_metrics).
+    partner_metrics = get_partner_leave_metrics(["Fine Media", "Sheer Logic"])
 
     # Data for Fine Media (example)
-    approved_days_finemedia = get_approved_days_for_partner("Fine Media")
-    deny_days_finemedia = get_denied_requests_for_partner("Fine Media")
-    cumulated_leave_finemedia = get_cumulated_leave_days_for_partner("Fine Media")
+    approved_days_finemedia = partner_metrics["Fine Media"]["approved_days"]
+    deny_days_finemedia = partner_metrics["Fine Media"]["denied_requests"]
+    cumulated_leave_finemedia = partner_metrics["Fine Media"]["cumulated_days"]
 
     # Data for Sheer Logic (example)
-    approved_days_sheerlogic = get_approved_days_for_partner("Sheer Logic")
-    deny_days_sheerlogic = get_denied_requests_for_partner("Sheer Logic")
-    cumulated_leave_sheerlogic = get_cumulated_leave_days_for_partner("Sheer Logic")
+    approved_days_sheerlogic = partner_metrics["Sheer Logic"]["approved_days"]
+    deny_days_sheerlogic = partner_metrics["Sheer Logic"]["denied_requests"]
+    cumulated_leave_sheerlogic = partner_metrics["Sheer Logic"]["cumulated_days"]
 
     # Fetch Upcoming and Currently on Leave from DB
     upcoming_leaves_df = pd.DataFrame(get_upcoming_leaves())
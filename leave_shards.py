@@ -0,0 +1,234 @@
+# --- leave_shards.py ---
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from employee_directory import get_directory
+
+# Shared (unsharded) database used by every page today.
+DB_PATH = 'leave_management.db'
+
+# Set to True to keep each partner's leaves in its own SQLite file under SHARD_DIR.
+# Leaves whose partner cannot be resolved still go to DB_PATH, which then acts as
+# the "unassigned" shard. Leaves written before sharding was switched on also stay in
+# DB_PATH; they are not migrated, instead every per-employee and per-partner read
+# also queries DB_PATH (see get_employee_rows and get_partner_leave_metrics).
+USE_PARTNER_SHARDS = False
+SHARD_DIR = 'leave_shards'
+
+# Partner label reported for rows that come from the unassigned shard (DB_PATH).
+UNASSIGNED = "Unassigned"
+
+# Partners we always create a shard for, even before anyone from them applies.
+PARTNERS = ["Fine Media", "Sheer Logic"]
+
+_executor_lock = threading.Lock()
+_executor = None
+
+
+def get_partners():
+    """Returns every known partner: the configured ones plus any found in the employee directory."""
+    partners = list(PARTNERS)
+    try:
+        for partner in get_directory().values("Partner"):
+            if partner not in partners:
+                partners.append(partner)
+    except FileNotFoundError:
+        pass
+    return partners
+
+
+def partner_for_employee(employee_name):
+    """Returns the partner an employee belongs to, or None if they are not in the employee directory."""
+    try:
+        records = get_directory().find_all(employee_name)
+    except FileNotFoundError:
+        print(f"Partner file not found; routing leave for {employee_name} to {DB_PATH}")
+        return None
+    partners = {record.partner for record in records}
+    if len(partners) > 1:
+        print(f"{employee_name} belongs to several partners {sorted(partners)}; routing leave to {DB_PATH}")
+        return None
+    return partners.pop() if partners else None
+
+
+def shard_path(partner):
+    """
+    Returns the database file that holds the given partner's leaves.
+    Without sharding (or for an unknown or UNASSIGNED partner) this is the shared DB_PATH.
+    """
+    if not USE_PARTNER_SHARDS or not partner or partner == UNASSIGNED:
+        return DB_PATH
+    file_name = "_".join(partner.lower().split()) + ".db"
+    return os.path.join(SHARD_DIR, file_name)
+
+
+def route_employee(employee_name, partner=None):
+    """Picks the shard a write for this employee should go to."""
+    if partner is None:
+        partner = partner_for_employee(employee_name)
+    return shard_path(partner)
+
+
+def shard_path_for_leave(partner):
+    """
+    Returns the shard holding an existing leave, for updates by leave id.
+    Leave ids are only unique within a shard, so with sharding on the caller must pass
+    the partner reported alongside the leave by the read functions (UNASSIGNED for DB_PATH).
+    """
+    if USE_PARTNER_SHARDS and partner is None:
+        raise ValueError("A partner is required to update a leave by id when partner sharding is enabled")
+    return shard_path(partner)
+
+
+def all_shard_paths():
+    """
+    Returns a list of (partner, db_path) for every shard a cross-partner query must visit.
+    The unassigned shard is listed as UNASSIGNED; without sharding DB_PATH is listed with partner None.
+    """
+    if not USE_PARTNER_SHARDS:
+        return [(None, DB_PATH)]
+    os.makedirs(SHARD_DIR, exist_ok=True)
+    return [(partner, shard_path(partner)) for partner in get_partners()] + [(UNASSIGNED, DB_PATH)]
+
+
+def _get_executor():
+    global _executor
+    # Streamlit runs each session on its own thread, so guard the lazy creation.
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) + 4),
+                                           thread_name_prefix="leave-shard")
+        return _executor
+
+
+def _query_shard(db_path, query, params):
+    # sqlite3 connections cannot be shared across threads, so each worker opens its own.
+    conn = sqlite3.connect(db_path)
+    try:
+        c = conn.cursor()
+        c.execute(query, params)
+        return c.fetchall()
+    finally:
+        conn.close()
+
+
+def _run_jobs(jobs):
+    """
+    Runs (partner, db_path, query, params) jobs on the thread pool.
+    Returns a list of (partner, rows) in job order. A shard that errors is
+    reported and contributes no rows, so one bad file does not blank the dashboard.
+    """
+    if len(jobs) == 1:
+        futures = None
+    else:
+        futures = [_get_executor().submit(_query_shard, db_path, query, params)
+                   for _, db_path, query, params in jobs]
+
+    results = []
+    for i, (partner, db_path, query, params) in enumerate(jobs):
+        try:
+            if futures is None:
+                rows = _query_shard(db_path, query, params)
+            else:
+                rows = futures[i].result()
+        except sqlite3.Error as e:
+            print(f"Error querying leave shard {db_path}: {e}")
+            rows = []
+        results.append((partner, rows))
+    return results
+
+
+def fan_out(query, params=()):
+    """Runs the same read query against every shard in parallel. Returns a list of (partner, rows)."""
+    return _run_jobs([(partner, db_path, query, params) for partner, db_path in all_shard_paths()])
+
+
+def fan_out_rows(query, params=(), sort_key=None, with_partner=False):
+    """
+    Fans a query out across all shards and merges the rows into a single list.
+    With 'with_partner' each row gets the partner of the shard it came from as a trailing column,
+    which is what update_leave_status/withdraw_leave need to find the leave again.
+    """
+    merged = []
+    for partner, rows in fan_out(query, params):
+        if with_partner:
+            rows = [row + (partner,) for row in rows]
+        merged.extend(rows)
+    if sort_key is not None:
+        merged.sort(key=sort_key)
+    return merged
+
+
+def get_employee_rows(employee_name, query, params=()):
+    """
+    Runs a per-employee query on the employee's shard and, with sharding on, also on
+    DB_PATH so leaves written there before sharding (or while unassigned) are not lost.
+    """
+    db_path = route_employee(employee_name)
+    jobs = [(None, db_path, query, params)]
+    if db_path != DB_PATH:
+        jobs.append((UNASSIGNED, DB_PATH, query, params))
+    merged = []
+    for _, rows in _run_jobs(jobs):
+        merged.extend(rows)
+    return merged
+
+
+def get_partner_leave_metrics(partners):
+    """
+    Computes approved days, declined requests and cumulated (approved + pending) days
+    for each partner in one aggregate query per shard, run in parallel.
+    Returns {partner: {"approved_days": ..., "denied_requests": ..., "cumulated_days": ...}}.
+
+    With sharding each partner's shard is summed as a whole, plus any rows in DB_PATH
+    that match the unsharded rule below (legacy leaves are read in place, not migrated).
+    Without sharding, partner membership falls back to matching the partner name inside employee_name.
+    """
+    query = """
+        SELECT
+            SUM(CASE WHEN status = 'Approved'
+                     THEN JULIANDAY(end_date) - JULIANDAY(start_date) + 1 END),
+            COUNT(CASE WHEN status = 'Declined' THEN id END),
+            SUM(CASE WHEN status IN ('Approved', 'Pending')
+                     THEN JULIANDAY(end_date) - JULIANDAY(start_date) + 1 END)
+        FROM leaves
+    """
+    jobs = [(partner, DB_PATH, query + " WHERE employee_name LIKE ?", (f"%{partner}%",))
+            for partner in partners]
+    if USE_PARTNER_SHARDS:
+        jobs += [(partner, shard_path(partner), query, ()) for partner in partners]
+
+    metrics = {partner: {"approved_days": 0, "denied_requests": 0, "cumulated_days": 0}
+               for partner in partners}
+    for partner, rows in _run_jobs(jobs):
+        approved, denied, cumulated = rows[0] if rows else (None, None, None)
+        metrics[partner]["approved_days"] += approved if approved is not None else 0
+        metrics[partner]["denied_requests"] += denied if denied is not None else 0
+        metrics[partner]["cumulated_days"] += cumulated if cumulated is not None else 0
+    return metrics
+
+
+def fetch_all_leaves():
+    """
+    Fetches all leave records from every shard.
+    Returns a list of dictionaries, each representing a leave record. 'partner' names the
+    shard the leave lives in (None without sharding) and must be passed back when updating it.
+    """
+    rows = fan_out_rows(
+        "SELECT id, employee_name, leave_type, start_date, end_date, description, status FROM leaves",
+        with_partner=True,
+    )
+    return [
+        {
+            "id": row[0],
+            "name": row[1],
+            "type": row[2],
+            "start": row[3],
+            "end": row[4],
+            "description": row[5],
+            "status": row[6],
+            "partner": row[7],
+        }
+        for row in rows
+    ]
@@ -32,6 +32,7 @@ payroll = st.Page(
 navigation = st.navigation({
     "Home": [home],
     'Leave Hub' :[leave_management],
+    "Agent Hub": [performance],
     "Payroll" : [payroll],
 })
 
@@ -5,6 +5,8 @@ import plotly.express as px
 import sqlite3
 import uuid # Needed for potential record IDs if adding/modifying leaves
 from datetime import datetime, timedelta # Needed for date handling
+from employee_directory import get_directory
+from workforce_trends import TREND_GROUPS, get_monthly_trends
 
 # --- Database connection path for leave management ---
 LEAVE_DB_PATH = 'leave_management.db'
@@ -43,35 +45,51 @@ def get_all_leaves():
 init_leave_db()
 
 
-# --- kenya_towns.py content (as provided) ---
-kenya_towns = {
-    "Nairobi": [
-        "Westlands", "Kilimani", "Kenyatta", "Karen", "Eastleigh",
-        "Lang’ata", "South B", "South C", "Ruaraka", "Dagoretti",
-        "Kasarani", "Gikambura"
-    ],
-    "Mombasa": [
-        "Mombasa Island", "Nyali", "Likoni", "Changamwe", "Kisauni",
-        "Bamburi", "Port Reitz", "Tudor", "Shanzu"
-    ],
-    "Uasin Gishu (Eldoret)": [
-        "Eldoret", "Turbo", "Ziwa", "Moi’s Bridge", "Kesses",
-        "Burnt Forest", "Soy"
-    ],
-    "Kisumu": [
-        "Kisumu", "Ahero", "Maseno", "Muhoroni", "Nyahera",
-        "Kombewa", "Koru", "Katito", "Kajulu"
-    ],
-    "Kajiado": [
-        "Kajiado", "Ngong", "Kitengela", "Isinya", "Namanga",
-        "Ongata Rongai", "Loitokitok", "Ilbisil", "Magadi"
-    ]
-}
-
-
 # --- Main HR Portal Content ---
 st.title("HR Portal: Leave & Partner Management")
 
 # Load partner data
+directory = get_directory()
+data = directory.data
+
+# --- Headcount by Region ---
+# 'Region' is the kenya_towns hierarchy joined against each employee's Location.
+st.subheader("Headcount by Region")
+region_headcount = pd.DataFrame({
+    'Region': directory.values('Region'),
+    'Headcount': [len(directory.rows('Region', region)) for region in directory.values('Region')]
+})
+unmapped = len(directory) - region_headcount['Headcount'].sum()
+region_graph = px.bar(data_frame=region_headcount, x='Region', y='Headcount')
+st.plotly_chart(region_graph)
+st.caption(f"{unmapped} employees work in locations outside the mapped regions.")
+
+# --- Headcount & Turnover Trends ---
+st.divider()
+st.subheader("Headcount & Turnover Trends")
+
+group_by = st.selectbox("Group by:", TREND_GROUPS)
+trends = get_monthly_trends(group_by)
+
+selected_groups = st.multiselect(
+    f"Select {group_by}:",
+    directory.values(group_by),
+    default=directory.values(group_by)[:5]
+)
+trends = trends[trends['group'].isin(selected_groups)]
+
+if trends.empty:
+    st.info("Select at least one group to see its trends.")
+else:
+    headcount_graph = px.line(data_frame=trends, x='month', y='headcount', color='group',
+                              title="Monthly Headcount")
+    st.plotly_chart(headcount_graph)
 
+    turnover_graph = px.line(data_frame=trends, x='month', y='turnover_rate', color='group',
+                             title="Monthly Turnover Rate (%)")
+    st.plotly_chart(turnover_graph)
 
+    movement = trends.groupby(trends['month'].dt.year)[['hires', 'exits']].sum().reset_index()
+    movement_graph = px.bar(data_frame=movement, x='month', y=['hires', 'exits'], barmode='group',
+                            title="Hires vs Exits per Year", labels={'month': 'Year'})
+    st.plotly_chart(movement_graph)
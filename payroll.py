@@ -2,20 +2,22 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 from millify import prettify
+from employee_directory import get_directory
 
 
 
-data = pd.read_csv("partner_streamlit.csv")
+directory = get_directory()
+data = directory.data
 st.title("Partner Payroll")
 
 # Dropdown for filtering by partner
 selected_partner = st.selectbox(
     "Select Partner:",
-    data['Partner'].unique()
+    directory.values('Partner')
 )
 
 # Filter data based on selected partner
-filtered_df = data[data['Partner'] == selected_partner]
+filtered_df = directory.slice('Partner', selected_partner)
 
 salary = filtered_df['Salary'].sum()
 department_avg_sal = round(filtered_df.groupby('Department')['Salary'].mean().reset_index(),0)
@@ -0,0 +1,129 @@
+# --- workforce_trends.py ---
+import threading
+import numpy as np
+import pandas as pd
+from employee_directory import get_directory
+
+# Groupings the trend engine supports; None means the whole workforce.
+TREND_GROUPS = ["Partner", "Department", "ManagerName"]
+
+DATE_FORMAT = "%m/%d/%Y"
+
+_cache_lock = threading.Lock()
+_trend_cache = {}
+
+
+def _month_number(dates):
+    """Converts a datetime Series to months since 1970-01; NaT entries are meaningless and must be masked."""
+    return dates.to_numpy(dtype="datetime64[M]").astype(np.int64)
+
+
+def _parse_employment_dates(directory):
+    """
+    Parses DateofHire and DateofTermination into datetime64 columns.
+    A DateofTermination of "Active" (or anything unparseable) becomes NaT, i.e. still employed.
+    """
+    data = directory.data
+    hired = pd.to_datetime(data["DateofHire"], format=DATE_FORMAT, errors="coerce")
+    terminated = pd.to_datetime(data["DateofTermination"], format=DATE_FORMAT, errors="coerce")
+    return hired, terminated
+
+
+def get_employment_dates(directory=None):
+    """Returns the cached (hired, terminated) datetime Series for the directory's dataset version."""
+    if directory is None:
+        directory = get_directory()
+    key = (directory.version, "dates")
+    with _cache_lock:
+        if key not in _trend_cache:
+            _trend_cache[key] = _parse_employment_dates(directory)
+        return _trend_cache[key]
+
+
+def _compute_monthly_trends(directory, group_by):
+    hired, terminated = get_employment_dates(directory)
+    hire_month = _month_number(hired)
+    exit_month = _month_number(terminated)
+
+    # Rows without a hire date cannot be placed on the timeline.
+    valid = hired.notna().to_numpy()
+    hire_month = hire_month[valid]
+    exit_month = exit_month[valid]
+    has_exit = terminated.notna().to_numpy()[valid]
+
+    if group_by is None:
+        labels = np.array(["All"], dtype=object)
+        codes = np.zeros(len(hire_month), dtype=np.int64)
+    else:
+        codes, labels = pd.factorize(directory.data[group_by].to_numpy()[valid])
+        codes = codes.astype(np.int64)
+    n_groups = len(labels)
+    if n_groups == 0 or len(hire_month) == 0:
+        return pd.DataFrame(columns=["group", "month", "headcount", "hires", "exits", "turnover_rate"])
+
+    # The grid spans every event month; a (bad) termination before the earliest hire
+    # must not produce a negative offset into the flattened (group, month) grid.
+    first = min(hire_month.min(), exit_month[has_exit].min()) if has_exit.any() else hire_month.min()
+    last = max(hire_month.max(), exit_month[has_exit].max()) if has_exit.any() else hire_month.max()
+    n_months = int(last - first + 1)
+
+    # One bincount per event type over a flattened (group, month) grid.
+    hires = np.bincount(codes * n_months + (hire_month - first),
+                        minlength=n_groups * n_months).reshape(n_groups, n_months)
+    exits = np.bincount(codes[has_exit] * n_months + (exit_month[has_exit] - first),
+                        minlength=n_groups * n_months).reshape(n_groups, n_months)
+
+    # Headcount at month end; an employee who leaves during a month is not counted at its end.
+    headcount = np.cumsum(hires - exits, axis=1)
+    opening = headcount - hires + exits
+    average = (opening + headcount) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        turnover = np.where(average > 0, exits / average * 100, np.nan)
+
+    months = pd.period_range(start=pd.Period(ordinal=int(first), freq="M"), periods=n_months, freq="M")
+    return pd.DataFrame({
+        "group": np.repeat(labels, n_months),
+        "month": np.tile(months.to_timestamp(), n_groups),
+        "headcount": headcount.ravel(),
+        "hires": hires.ravel(),
+        "exits": exits.ravel(),
+        "turnover_rate": np.round(turnover.ravel(), 2),
+    })
+
+
+def get_monthly_trends(group_by=None, directory=None):
+    """
+    Returns monthly headcount, hires, exits and turnover (% of average headcount) per group.
+    'group_by' is one of TREND_GROUPS or None for the whole workforce.
+    Results are cached per dataset version; treat the returned DataFrame as read-only.
+    """
+    if group_by is not None and group_by not in TREND_GROUPS:
+        raise ValueError(f"Unsupported trend grouping: {group_by}")
+    if directory is None:
+        directory = get_directory()
+    key = (directory.version, group_by)
+    with _cache_lock:
+        cached = _trend_cache.get(key)
+    if cached is None:
+        cached = _compute_monthly_trends(directory, group_by)
+        with _cache_lock:
+            # Drop results for older dataset versions.
+            for stale in [k for k in _trend_cache if k[0] != directory.version]:
+                del _trend_cache[stale]
+            _trend_cache[key] = cached
+    return cached
+
+
+def get_turnover_rate(column, value, directory=None):
+    """
+    Returns the share (%) of the employees in a group who have left, counting only
+    rows with a real DateofTermination.
+    """
+    if directory is None:
+        directory = get_directory()
+    rows = directory.rows(column, value)
+    if len(rows) == 0:
+        return 0.0
+    _, terminated = get_employment_dates(directory)
+    exits = terminated.to_numpy()[rows]
+    return round(float(pd.notna(exits).sum()) / len(rows) * 100, 1)